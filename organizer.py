@@ -6,73 +6,359 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import mmap
+import os
 import shutil
 import sys
-from datetime import datetime, timezone
+import time
+import unicodedata
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:  # optional: much faster content hashing for dedupe
+    import blake3
+except ImportError:
+    blake3 = None
+if blake3 is not None and not hasattr(blake3.blake3, "update_mmap"):
+    blake3 = None  # releases without update_mmap: stay on SHA-256
+
+try:  # optional: faster report serialization
+    import orjson
+except ImportError:
+    orjson = None
+
 # ── hashing ──────────────────────────────────────────────────────────────────
 
 CHUNK = 8 * 1024 * 1024  # 8 MB
+MMAP_THRESHOLD = 10 * 1024 * 1024  # 10 MB – below this mmap setup dominates
+PREFIX_BYTES = 4096  # compared before paying for a full hash
+HASH_WORKERS = min(8, os.cpu_count() or 1)  # hashlib/blake3 release the GIL
+QUEUE_DEPTH = 64  # max hashes in flight at once
+
+
+def sha256(path: Path, size: int) -> bytes:
+    # large files: hash straight from the page cache, no per-chunk copies
+    if size >= MMAP_THRESHOLD:
+        h = hashlib.sha256()
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            h.update(mm)
+        return h.digest()
+
+    # hashlib.file_digest (3.11+) runs the read/update loop in C
+    file_digest = getattr(hashlib, "file_digest", None)
+    if file_digest is not None:
+        with path.open("rb", buffering=0) as f:
+            return file_digest(f, "sha256").digest()
 
-
-def sha256(path: Path) -> str:
     h = hashlib.sha256()
     with path.open("rb") as f:
         while chunk := f.read(CHUNK):
             h.update(chunk)
-    return h.hexdigest()
+    return h.digest()
+
+
+def cpu_has_sha_extensions() -> bool | None:
+    """Whether the CPU advertises SHA-256 instructions (None if unknown).
+
+    OpenSSL, and therefore hashlib, dispatches to SHA-NI (x86) or the
+    ARMv8 SHA2 extensions when present; without them SHA-256 runs scalar.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    for line in cpuinfo.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() in ("flags", "features"):
+            flags = value.split()
+            return "sha_ni" in flags or "sha2" in flags
+    return None
+
+
+HASH_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+
+
+def content_hash(path: Path, size: int) -> bytes:
+    """Raw digest used for dedupe (BLAKE3 if installed, else SHA-256)."""
+    if blake3 is None:
+        return sha256(path, size)
+    # already running inside the hash pool: only large files are worth
+    # BLAKE3's own multithreading
+    threads = blake3.blake3.AUTO if size >= MMAP_THRESHOLD else 1
+    h = blake3.blake3(max_threads=threads)
+    h.update_mmap(path)
+    return h.digest()
+
+
+def hash_ahead(
+    files: Iterable[tuple[Path, int]],
+    pool: ThreadPoolExecutor,
+    depth: int = QUEUE_DEPTH,
+) -> Iterator[Future]:
+    """Yield a content_hash future per (path, size), keeping *depth* in flight.
+
+    Reads of upcoming files overlap with processing of the current one,
+    while memory stays bounded regardless of how many files there are.
+    """
+    it = iter(files)
+    window: deque[Future] = deque(
+        pool.submit(content_hash, *item) for _, item in zip(range(depth), it)
+    )
+    while window:
+        future = window.popleft()
+        for item in it:
+            window.append(pool.submit(content_hash, *item))
+            break
+        yield future
+
+
+def _read_prefix(path: Path) -> bytes:
+    with path.open("rb") as f:
+        return f.read(PREFIX_BYTES)
+
+
+def dedupe_candidates(files: list[tuple[Path, os.stat_result]]) -> set[Path]:
+    """Return the files that may have a duplicate and so need a full hash.
+
+    Files with a unique size, or a unique first 4 KB among files of the
+    same size, cannot be duplicates of anything else in *files*.
+    """
+    by_size: dict[int, list[Path]] = {}
+    candidates: set[Path] = set()
+    for path, st in files:
+        by_size.setdefault(st.st_size, []).append(path)
+
+    for group in by_size.values():
+        if len(group) < 2:
+            continue
+        by_prefix: dict[bytes, list[Path]] = {}
+        for path in group:
+            try:
+                by_prefix.setdefault(_read_prefix(path), []).append(path)
+            except OSError:
+                candidates.add(path)  # let the hashing step report the error
+        for same in by_prefix.values():
+            if len(same) > 1:
+                candidates.update(same)
+    return candidates
+
+
+# ── copying ──────────────────────────────────────────────────────────────────
+
+COPY_BUFFER = 1024 * 1024  # 1 MB – shutil's default is 64 KB
+
+
+def _kernel_copy(infd: int, outfd: int, size: int) -> bool:
+    """Copy *infd* to EOF in-kernel; False if no zero-copy call is usable.
+
+    copy_file_range can reflink on CoW filesystems and copy server-side
+    on NFS; sendfile still avoids the round trip through user space.
+    *size* (from fstat) only sets the block size – like shutil, keep
+    going until the call returns 0 so a file that grew is copied whole.
+    """
+    blocksize = max(size, 8 * 1024 * 1024)
+    for name in ("copy_file_range", "sendfile"):
+        fn = getattr(os, name, None)
+        if fn is None:
+            continue
+        copied = 0
+        try:
+            while True:
+                if name == "copy_file_range":
+                    n = fn(infd, outfd, blocksize)
+                else:
+                    n = fn(outfd, infd, copied, blocksize)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            if copied:  # partial copy – don't silently restart
+                raise
+            continue
+        if copied:
+            if copied < size:
+                raise OSError(f"short copy: {copied} of {size} bytes")
+            return True
+        # some filesystems (FUSE, procfs, cross-fs on older kernels)
+        # report 0 bytes instead of an error – try the next method
+    return False
+
+
+def _buffered_copy(fsrc, fdst) -> None:
+    buf = bytearray(COPY_BUFFER)
+    view = memoryview(buf)
+    while n := fsrc.readinto(buf):
+        fdst.write(view[:n])
+
+
+def fast_copy(src: Path, dst: Path) -> None:
+    """Copy *src* to *dst*, preserving metadata like copy2.
+
+    Tries copy_file_range, then sendfile, then a 1 MB readinto loop.
+    """
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if not _kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+            _buffered_copy(fsrc, fdst)
+    shutil.copystat(src, dst)
 
 
 # ── destination helpers ──────────────────────────────────────────────────────
 
 
+@lru_cache(maxsize=512)
+def _ext_from_suffix(suffix: str) -> str:
+    return suffix.lstrip(".").lower() or "no_ext"
+
+
 def _ext_folder(path: Path) -> str:
-    return path.suffix.lstrip(".").lower() or "no_ext"
+    return _ext_from_suffix(path.suffix)
+
+
+@lru_cache(maxsize=None)
+def _month_for_hour(hour: int) -> str:
+    tm = time.gmtime(hour * 3600)
+    return f"{tm.tm_year:04d}-{tm.tm_mon:02d}"
 
 
-def _date_folder(path: Path) -> str:
-    mtime = path.stat().st_mtime
-    return datetime.fromtimestamp(mtime, tz=timezone.utc).strftime("%Y-%m")
+def _date_folder(st: os.stat_result) -> str:
+    # UTC months start on an hour boundary, so the hour is a safe cache key
+    return _month_for_hour(int(st.st_mtime // 3600))
 
 
-def dest_for(path: Path, output: Path, by: str) -> Path:
-    ext = _ext_folder(path)
-    date = _date_folder(path)
+def dest_builder(output: Path, by: str) -> Callable[[Path, os.stat_result], Path]:
+    """Return a function mapping (path, stat) to its destination for *by*.
+
+    Selected once per run, so each file only computes the parts it needs.
+    """
     match by:
         case "type":
-            return output / ext / path.name
+            return lambda path, st: output / _ext_folder(path) / path.name
         case "date":
-            return output / date / path.name
+            return lambda path, st: output / _date_folder(st) / path.name
         case "type-date":
-            return output / ext / date / path.name
+            return lambda path, st: (
+                output / _ext_folder(path) / _date_folder(st) / path.name
+            )
         case _:
             raise ValueError(f"Unknown --by value: {by}")
 
 
-def safe_dest(dest: Path) -> Path:
-    """Append _1, _2, … before the extension until the name is unused."""
-    if not dest.exists():
-        return dest
-    stem, suffix = dest.stem, dest.suffix
+def _name_key(name: str) -> str:
+    return unicodedata.normalize("NFC", name).casefold()
+
+
+def _is_case_insensitive(folder: Path) -> bool:
+    """Whether *folder* matches names case-insensitively (APFS, NTFS, …).
+
+    Stats a case-swapped name of an existing entry – one inside the folder
+    if there is any, otherwise the folder itself or its nearest parent.
+    """
+    try:
+        entries = [folder / name for name in os.listdir(folder)]
+    except OSError:
+        entries = []
+    for probe in (*entries, folder, *folder.parents):
+        swapped = probe.name.swapcase()
+        if swapped == probe.name:
+            continue
+        try:
+            st = probe.lstat()
+        except OSError:
+            continue  # not created yet
+        try:
+            return os.path.samestat(st, probe.with_name(swapped).lstat())
+        except OSError:
+            return False
+    return False
+
+
+class _FolderNames:
+    """Names taken in one output folder, exact and case/Unicode-folded."""
+
+    __slots__ = ("folder", "exact", "folded", "_case_insensitive")
+
+    def __init__(self, folder: Path) -> None:
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            names = []
+        self.folder = folder
+        self.exact = set(names)
+        self.folded = {_name_key(name) for name in names}
+        self._case_insensitive: bool | None = None
+
+    def is_taken(self, name: str) -> bool:
+        if name in self.exact:
+            return True
+        if _name_key(name) not in self.folded:
+            return False
+        # only a folded match: probe the volume once per folder
+        if self._case_insensitive is None:
+            self._case_insensitive = _is_case_insensitive(self.folder)
+        return self._case_insensitive
+
+    def add(self, name: str) -> None:
+        self.exact.add(name)
+        self.folded.add(_name_key(name))
+
+
+def safe_dest(dest: Path, reserved: dict[Path, _FolderNames]) -> Path:
+    """Append _1, _2, … before the extension until the name is unused.
+
+    *reserved* tracks the names already taken in each output folder –
+    listed from disk on first use, then updated in memory – so collisions
+    cost set lookups rather than a stat per attempt.
+    """
     parent = dest.parent
+    taken = reserved.get(parent)
+    if taken is None:
+        taken = reserved[parent] = _FolderNames(parent)
+
+    candidate = dest
+    stem, suffix = dest.stem, dest.suffix
     n = 1
-    while True:
+    while taken.is_taken(candidate.name):
         candidate = parent / f"{stem}_{n}{suffix}"
-        if not candidate.exists():
-            return candidate
         n += 1
+    taken.add(candidate.name)
+    return candidate
 
 
 # ── core logic ───────────────────────────────────────────────────────────────
 
 
-def collect_files(input_dir: Path, recursive: bool) -> list[Path]:
-    pattern = "**/*" if recursive else "*"
-    return sorted(
-        p for p in input_dir.glob(pattern)
-        if p.is_file() and not p.name.startswith(".")
-    )
+def collect_files(
+    input_dir: Path, recursive: bool
+) -> list[tuple[Path, os.stat_result]]:
+    """Return (path, stat) pairs; the stat is reused downstream."""
+    found = []
+    stack = [input_dir]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:  # missing or unreadable folder – skip like glob did
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(Path(entry.path))
+                    elif entry.name.startswith("."):
+                        continue
+                    elif entry.is_file():
+                        found.append((Path(entry.path), entry.stat()))
+                except OSError:  # e.g. broken or looping symlink
+                    continue
+    return sorted(found, key=lambda item: item[0])
 
 
 def organize(args: argparse.Namespace) -> dict:
@@ -85,10 +371,19 @@ def organize(args: argparse.Namespace) -> dict:
 
     files = collect_files(input_dir, args.recursive)
 
-    seen_hashes: dict[str, Path] = {}  # hash -> first-occurrence source
-    actions: list[dict] = []
+    seen_hashes: dict[bytes, Path] = {}  # digest -> first-occurrence source
+    # per-file results, stored column-wise (one entry per file in each)
+    sources: list[str] = []
+    dests: list[str | None] = []
+    labels: list[str] = []
+    reasons: list[str | None] = []
+    file_hashes: list[bytes | None] = []  # raw digests, hex-encoded at emit
+    top_folders: list[str] = []  # top-level output folder of each written file
     errors: list[dict] = []
     folders_created: set[str] = set()
+    reserved: dict[Path, _FolderNames] = {}  # output folder -> names taken
+    created_dirs: set[Path] = set()  # folders already mkdir'd this run
+    dest_for = dest_builder(output_dir, args.by)
     totals = {
         "scanned_files": len(files),
         "copied": 0,
@@ -98,75 +393,89 @@ def organize(args: argparse.Namespace) -> dict:
         "errors": 0,
     }
 
-    for src in files:
-        try:
-            file_hash = sha256(src)
-
-            # ── dedupe check ─────────────────────────────────────────────
-            is_dup = file_hash in seen_hashes
-            if not is_dup:
-                seen_hashes[file_hash] = src
-
-            if is_dup and args.dedupe == "delete":
-                actions.append({
-                    "source": str(src),
-                    "dest": None,
-                    "action": "skipped",
-                    "reason": f"duplicate of {seen_hashes[file_hash]}",
-                    "hash": file_hash,
-                })
-                totals["skipped_duplicates"] += 1
-                continue
-
-            if is_dup and args.dedupe == "move":
-                dest = safe_dest(output_dir / "Duplicates" / src.name)
-                action_label = "duplicate_moved"
-            else:
-                dest = safe_dest(dest_for(src, output_dir, args.by))
-                action_label = "move" if args.move else "copy"
-
-            # ── perform filesystem action ────────────────────────────────
-            folders_created.add(str(dest.parent))
-            if not args.dry_run:
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                if args.move and action_label != "duplicate_moved":
-                    shutil.move(str(src), str(dest))
+    # ── phase 1: hash possible duplicates concurrently ──────────────────
+    # hashes are only needed for dedupe, and only for files sharing a
+    # size and prefix with another file; the rest are unique by definition
+    candidates = dedupe_candidates(files) if args.dedupe != "off" else set()
+    pool: ThreadPoolExecutor | None = None
+    hashes: Iterator[Future] = iter(())
+    if candidates:
+        pool = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+        hashes = hash_ahead(
+            ((src, st.st_size) for src, st in files if src in candidates), pool
+        )
+
+    # ── phase 2: act on each file in order ───────────────────────────────
+    # per-run decisions are resolved here rather than once per file
+    dedupe, move, dry_run = args.dedupe, args.move, args.dry_run
+    duplicates_dir = output_dir / "Duplicates"
+    main_label = "move" if move else "copy"
+    total_key = {"duplicate_moved": "duplicates_moved", "move": "moved", "copy": "copied"}
+
+    try:
+        for src, st in files:
+            try:
+                file_hash = next(hashes).result() if src in candidates else None
+
+                # ── dedupe check ─────────────────────────────────────────
+                is_dup = file_hash in seen_hashes
+                if not is_dup and file_hash is not None:
+                    seen_hashes[file_hash] = src
+
+                if is_dup and dedupe == "delete":
+                    sources.append(str(src))
+                    dests.append(None)
+                    labels.append("skipped")
+                    reasons.append(f"duplicate of {seen_hashes[file_hash]}")
+                    file_hashes.append(file_hash)
+                    totals["skipped_duplicates"] += 1
+                    continue
+
+                if is_dup and dedupe == "move":
+                    dest = safe_dest(duplicates_dir / src.name, reserved)
+                    action_label = "duplicate_moved"
                 else:
-                    shutil.copy2(str(src), str(dest))
-                    # For dedupe=move we still *copy* to Duplicates
-                    # (originals stay untouched unless --move is set)
-                    if action_label == "duplicate_moved" and args.move:
-                        src.unlink()
-
-            actions.append({
-                "source": str(src),
-                "dest": str(dest),
-                "action": action_label,
-                "hash": file_hash,
-            })
-
-            if action_label == "duplicate_moved":
-                totals["duplicates_moved"] += 1
-            elif action_label == "move":
-                totals["moved"] += 1
-            else:
-                totals["copied"] += 1
-
-        except Exception as exc:
-            errors.append({"source": str(src), "error": str(exc)})
-            totals["errors"] += 1
+                    dest = safe_dest(dest_for(src, st), reserved)
+                    action_label = main_label
+
+                # ── perform filesystem action ────────────────────────────
+                folders_created.add(str(dest.parent))
+                if not dry_run:
+                    if dest.parent not in created_dirs:
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(dest.parent)
+                    if move and action_label != "duplicate_moved":
+                        shutil.move(str(src), str(dest))
+                    else:
+                        fast_copy(src, dest)
+                        # For dedupe=move we still *copy* to Duplicates
+                        # (originals stay untouched unless --move is set)
+                        if action_label == "duplicate_moved" and move:
+                            src.unlink()
+
+                try:
+                    top_folders.append(dest.relative_to(output_dir).parts[0])
+                except (ValueError, IndexError):
+                    top_folders.append("other")
+
+                sources.append(str(src))
+                dests.append(str(dest))
+                labels.append(action_label)
+                reasons.append(None)
+                file_hashes.append(file_hash)
+
+                totals[total_key[action_label]] += 1
+
+            except Exception as exc:
+                errors.append({"source": str(src), "error": str(exc)})
+                totals["errors"] += 1
+    finally:
+        if pool is not None:
+            # drop queued hashes if we are leaving early (e.g. Ctrl+C)
+            pool.shutdown(cancel_futures=True)
 
     # ── build breakdown by top-level folder ─────────────────────────────
-    folder_counts: dict[str, int] = {}
-    for entry in actions:
-        if entry["dest"] is None:
-            continue
-        dest_path = Path(entry["dest"])
-        try:
-            top_folder = dest_path.relative_to(output_dir).parts[0]
-        except (ValueError, IndexError):
-            top_folder = "other"
-        folder_counts[top_folder] = folder_counts.get(top_folder, 0) + 1
+    folder_counts = Counter(top_folders)
 
     breakdown = {
         **dict(sorted(folder_counts.items())),
@@ -174,8 +483,21 @@ def organize(args: argparse.Namespace) -> dict:
     }
 
     # ── build report ─────────────────────────────────────────────────────
+    actions: list[dict] = []
+    for source, dest_str, label, reason, file_hash in zip(
+        sources, dests, labels, reasons, file_hashes
+    ):
+        entry = {"source": source, "dest": dest_str, "action": label}
+        if reason is not None:
+            entry["reason"] = reason
+        entry["hash"] = file_hash.hex() if file_hash is not None else None
+        actions.append(entry)
+
     report = {
         "settings": vars(args),
+        "hash_algorithm": (
+            HASH_ALGORITHM if any(h is not None for h in file_hashes) else None
+        ),
         "totals": totals,
         "folders_created": sorted(folders_created),
         "breakdown": breakdown,
@@ -185,6 +507,24 @@ def organize(args: argparse.Namespace) -> dict:
     return report
 
 
+# ── report ───────────────────────────────────────────────────────────────────
+
+
+def write_report(report: dict, path: Path) -> None:
+    """Write *report* as indented JSON without building a second full copy."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        except TypeError:  # e.g. undecodable filenames (surrogate escapes)
+            pass
+        else:
+            path.write_bytes(data)
+            return
+    # json.dump encodes incrementally, writing chunks as it goes
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
 # ── CLI ──────────────────────────────────────────────────────────────────────
 
 
@@ -209,13 +549,19 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main() -> None:
     args = build_parser().parse_args()
+
+    if (args.dedupe != "off" and HASH_ALGORITHM == "sha256"
+            and cpu_has_sha_extensions() is False):
+        print("Note: CPU reports no SHA-256 instructions; hashing will be slower "
+              "(install blake3 or see README 'Performance').", file=sys.stderr)
+
     report = organize(args)
 
     # write report next to the output dir (repo root by convention)
     report_path = Path(args.report).resolve()
     if not args.dry_run:
         report_path.parent.mkdir(parents=True, exist_ok=True)
-        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        write_report(report, report_path)
 
     t = report["totals"]
     bd = report["breakdown"]